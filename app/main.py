@@ -9,6 +9,7 @@ from uvicorn.logging import ColourizedFormatter
 
 from app.database import create_db
 import app.routes as routes
+from app.rule.rule_snapshot import RuleSnapshot
 from app.settings_env import get_env_settings
 from app.settings import Settings
 from app.utility.vice_county.vc_checker import VcChecker
@@ -55,6 +56,15 @@ async def lifespan(app: FastAPI):
         repo = UserRepo(session)
         repo.create_initial_user(env)
 
+    # Load the rules into memory for verification.
+    with Session(engine) as session:
+        RuleSnapshot.publish(RuleSnapshot.build(
+            session,
+            env,
+            settings.db.rules_commit,
+            settings.db.rules_update_time
+        ))
+
     # Load the county data once.
     VcChecker.load_data()
 
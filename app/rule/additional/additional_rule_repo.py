@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 import pandas as pd
 
 from sqlmodel import select
@@ -7,10 +9,18 @@ import app.species.cache as cache
 from app.sqlmodels import AdditionalCode, AdditionalRule, Taxon, OrgGroup
 from app.verify.verify_models import Verified
 
+from ..org_group.org_group_repo import OrgGroupItem
 from ..rule_repo_base import RuleRepoBase
 from .additional_code_repo import AdditionalCodeRepo
 
 
+class AdditionalItem(NamedTuple):
+    """An additional rule held in memory for verification."""
+    org_group: OrgGroupItem
+    code: int
+    text: str
+
+
 class AdditionalRuleRepo(RuleRepoBase):
     default_file = 'additional.csv'
 
@@ -133,35 +143,67 @@ class AdditionalRuleRepo(RuleRepoBase):
 
         return errors
 
-    def run(self, record: Verified, org_group_id: int | None = None):
+    def get_rules(self, organism_keys: list[str] | None = None):
+        """Get the rules for a batch of taxa, or all taxa if None.
+
+        Returns a dictionary, keyed by organism_key, of lists of
+        AdditionalItem. Taxa without rules are omitted."""
+        rules = {}
+        for batch in self.batches(organism_keys):
+            query = (
+                select(AdditionalRule.organism_key, OrgGroup, AdditionalCode)
+                .select_from(AdditionalRule)
+                .join(AdditionalCode)
+                .join(OrgGroup)
+                .order_by(OrgGroup.organisation, OrgGroup.group)
+            )
+            if batch is not None:
+                query = query.where(AdditionalRule.organism_key.in_(batch))
+            results = self.db.exec(query).all()
+
+            for organism_key, org_group, additional_code in results:
+                rules.setdefault(organism_key, []).append(AdditionalItem(
+                    OrgGroupItem.from_org_group(org_group),
+                    additional_code.code,
+                    additional_code.text
+                ))
+
+        return rules
+
+    def run(
+        self,
+        record: Verified,
+        org_group_id: int | None = None,
+        rules: list[AdditionalItem] | None = None
+    ):
         """Run rules against record, optionally filter rules by org_group.
 
         Returns a tuple of (ok, messages) where ok indicates test success
-        and messages is a list of details. If there are no rules, ok is None"""
+        and messages is a list of details. If there are no rules, ok is None.
+
+        The rules for the taxon of the record, as returned by get_rules(), can
+        be supplied to save querying the database."""
 
         ok = True
         messages = []
 
-        query = (
-            select(OrgGroup, AdditionalCode)
-            .select_from(AdditionalRule)
-            .join(AdditionalCode)
-            .join(OrgGroup)
-            .where(AdditionalRule.organism_key == record.organism_key)
-        )
+        if rules is None:
+            rules = self.get_rules(
+                [record.organism_key]).get(record.organism_key, [])
         if org_group_id is not None:
-            query = query.where(OrgGroup.id == org_group_id)
+            rules = [
+                rule for rule in rules if rule.org_group.id == org_group_id
+            ]
 
-        rules = self.db.exec(query).all()
         # Do we have any rules?
         if len(rules) == 0:
             return None, []
 
-        for org_group, additional_code in rules:
+        for org_group, code, text in rules:
             ok = False
             messages.append(
                 f"{org_group.organisation}:{org_group.group}:additional: "
-                f"{additional_code.text}"
+                f"{text}"
             )
 
         return ok, messages
@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 import pandas as pd
 
 from sqlmodel import select
@@ -7,10 +9,18 @@ import app.species.cache as cache
 from app.sqlmodels import DifficultyCode, DifficultyRule, Taxon, OrgGroup
 from app.verify.verify_models import Verified
 
+from ..org_group.org_group_repo import OrgGroupItem
 from ..rule_repo_base import RuleRepoBase
 from .difficulty_code_repo import DifficultyCodeRepo
 
 
+class DifficultyItem(NamedTuple):
+    """A difficulty rule held in memory for verification."""
+    org_group: OrgGroupItem
+    code: int
+    text: str
+
+
 class DifficultyRuleRepo(RuleRepoBase):
     default_file = 'id_difficulty.csv'
 
@@ -135,47 +145,74 @@ class DifficultyRuleRepo(RuleRepoBase):
 
         return errors
 
+    def get_rules(self, organism_keys: list[str] | None = None):
+        """Get the rules for a batch of taxa, or all taxa if None.
+
+        Returns a dictionary, keyed by organism_key, of lists of
+        DifficultyItem. Taxa without rules are omitted."""
+        rules = {}
+        for batch in self.batches(organism_keys):
+            query = (
+                select(DifficultyRule.organism_key, OrgGroup, DifficultyCode)
+                .select_from(DifficultyRule)
+                .join(DifficultyCode)
+                .join(OrgGroup)
+                .order_by(OrgGroup.organisation, OrgGroup.group)
+            )
+            if batch is not None:
+                query = query.where(DifficultyRule.organism_key.in_(batch))
+            results = self.db.exec(query).all()
+
+            for organism_key, org_group, difficulty_code in results:
+                rules.setdefault(organism_key, []).append(DifficultyItem(
+                    OrgGroupItem.from_org_group(org_group),
+                    difficulty_code.code,
+                    difficulty_code.text
+                ))
+
+        return rules
+
     def run(
         self,
         record: Verified,
         verbose: bool = True,
         org_group_id: int | None = None,
+        rules: list[DifficultyItem] | None = None
     ):
         """Run rules against record, optionally filter rules by org_group.
 
         Returns a tuple of (id_difficulty, messages) where id_difficulty is the
         maximum difficulty code found and messages is a list of difficulty
         text. If no rules are found, id_difficulty is None. If verbose is
-        False, messages is an empty list."""
+        False, messages is an empty list.
+
+        The rules for the taxon of the record, as returned by get_rules(), can
+        be supplied to save querying the database."""
         messages = []
         id_difficulty = 0
 
-        query = (
-            select(OrgGroup, DifficultyCode)
-            .select_from(DifficultyRule)
-            .join(DifficultyCode)
-            .join(OrgGroup)
-            .where(DifficultyRule.organism_key == record.organism_key)
-        )
+        if rules is None:
+            rules = self.get_rules(
+                [record.organism_key]).get(record.organism_key, [])
         if org_group_id is not None:
-            query = query.where(OrgGroup.id == org_group_id)
-
-        results = self.db.exec(query).all()
+            rules = [
+                rule for rule in rules if rule.org_group.id == org_group_id
+            ]
 
         # Do we have any id_difficulties?
-        if len(results) == 0:
+        if len(rules) == 0:
             return None, []
 
         # Find maximum difficulty code. The intention is to remove duplicates
         # in future. See
         # https://github.com/BiologicalRecordsCentre/record-cleaner-rules/issues/16
-        for org_group, difficulty_code in results:
-            if difficulty_code.code > id_difficulty:
-                id_difficulty = difficulty_code.code
+        for org_group, code, text in rules:
+            if code > id_difficulty:
+                id_difficulty = code
             if verbose:
                 messages.append(
                     f"{org_group.organisation}:{org_group.group}:difficulty:"
-                    f"{difficulty_code.code}: {difficulty_code.text}"
+                    f"{code}: {text}"
                 )
 
         return id_difficulty, messages
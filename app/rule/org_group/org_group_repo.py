@@ -1,10 +1,22 @@
 import os
+from typing import NamedTuple
 
 from sqlmodel import Session, select
 
 from app.sqlmodels import OrgGroup
 
 
+class OrgGroupItem(NamedTuple):
+    """An immutable copy of an OrgGroup for use in verification."""
+    id: int
+    organisation: str
+    group: str
+
+    @classmethod
+    def from_org_group(cls, org_group: OrgGroup):
+        return cls(org_group.id, org_group.organisation, org_group.group)
+
+
 class OrgGroupRepo:
 
     def __init__(self, db: Session):
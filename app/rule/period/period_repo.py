@@ -1,4 +1,6 @@
 from datetime import date
+from typing import NamedTuple
+
 import pandas as pd
 
 from sqlmodel import select
@@ -9,9 +11,18 @@ from app.utility.vague_date import VagueDate
 from app.sqlmodels import PeriodRule, Taxon, OrgGroup
 from app.verify.verify_models import Verified
 
+from ..org_group.org_group_repo import OrgGroupItem
 from ..rule_repo_base import RuleRepoBase
 
 
+class PeriodItem(NamedTuple):
+    """A period rule held in memory for verification."""
+    org_group: OrgGroupItem
+    # Dates in yyyy-mm-dd format.
+    start_date: str | None
+    end_date: str | None
+
+
 class PeriodRuleRepo(RuleRepoBase):
     default_file = 'period.csv'
 
@@ -174,53 +185,87 @@ class PeriodRuleRepo(RuleRepoBase):
 
         return errors
 
-    def run(self, record: Verified, org_group_id: int | None = None):
+    def get_rules(self, organism_keys: list[str] | None = None):
+        """Get the rules for a batch of taxa, or all taxa if None.
+
+        Returns a dictionary, keyed by organism_key, of lists of PeriodItem.
+        Taxa without rules are omitted."""
+        rules = {}
+        for batch in self.batches(organism_keys):
+            query = (
+                select(PeriodRule, OrgGroup)
+                .join(OrgGroup)
+                .order_by(OrgGroup.organisation, OrgGroup.group)
+            )
+            if batch is not None:
+                query = query.where(PeriodRule.organism_key.in_(batch))
+            results = self.db.exec(query).all()
+
+            for period_rule, org_group in results:
+                rules.setdefault(period_rule.organism_key, []).append(
+                    PeriodItem(
+                        OrgGroupItem.from_org_group(org_group),
+                        period_rule.start_date,
+                        period_rule.end_date
+                    )
+                )
+
+        return rules
+
+    def run(
+        self,
+        record: Verified,
+        org_group_id: int | None = None,
+        rules: list[PeriodItem] | None = None
+    ):
         """Run rules against record, optionally filter rules by org_group.
 
         Returns a tuple of (ok, messages) where ok indicates test success
-        and messages is a list of details. If there are no rules, ok is None"""
+        and messages is a list of details. If there are no rules, ok is None.
+
+        The rules for the taxon of the record, as returned by get_rules(), can
+        be supplied to save querying the database."""
 
         ok = True
         messages = []
 
-        vague_date = VagueDate(record.date).value
-        start_date = vague_date['start'].strftime('%Y-%m-%d')
-        end_date = vague_date['end'].strftime('%Y-%m-%d')
-
-        query = (
-            select(PeriodRule, OrgGroup)
-            .join(OrgGroup)
-            .where(PeriodRule.organism_key == record.organism_key)
-        )
+        if rules is None:
+            rules = self.get_rules(
+                [record.organism_key]).get(record.organism_key, [])
         if org_group_id is not None:
-            query = query.where(OrgGroup.id == org_group_id)
+            rules = [
+                rule for rule in rules if rule.org_group.id == org_group_id
+            ]
 
-        rules = self.db.exec(query).all()
         # Do we have any rules?
         if len(rules) == 0:
             return None, []
 
-        for period_rule, org_group in rules:
+        vague_date = VagueDate(record.date).value
+        start_date = vague_date['start'].strftime('%Y-%m-%d')
+        end_date = vague_date['end'].strftime('%Y-%m-%d')
+
+        for org_group, rule_start_date, rule_end_date in rules:
             if (
-                period_rule.start_date is not None and
-                end_date < period_rule.start_date
+                rule_start_date is not None and
+                end_date < rule_start_date
             ):
                 ok = False
                 messages.append(
                     f"{org_group.organisation}:{org_group.group}:period: "
                     f"Record is before introduction date of "
-                    f"{period_rule.start_date}"
+                    f"{rule_start_date}"
                 )
 
             if (
-                period_rule.end_date is not None and
-                start_date > period_rule.end_date
+                rule_end_date is not None and
+                start_date > rule_end_date
             ):
                 ok = False
                 messages.append(
                     f"{org_group.organisation}:{org_group.group}:period: "
                     f"Record follows extinction date of "
-                    f"{period_rule.end_date}"
+                    f"{rule_end_date}"
                 )
 
         return ok, messages
@@ -1,7 +1,9 @@
 from datetime import date
+from typing import NamedTuple
+
 import pandas as pd
 
-from sqlmodel import select, or_
+from sqlmodel import select
 
 import app.species.cache as cache
 from app.utility.vague_date import VagueDate
@@ -9,10 +11,22 @@ from app.utility.vague_date import VagueDate
 from app.sqlmodels import PhenologyRule, Taxon, OrgGroup, Stage, StageSynonym
 from app.verify.verify_models import Verified
 
+from ..org_group.org_group_repo import OrgGroupItem
 from ..rule_repo_base import RuleRepoBase
 from ..stage.stage_repo import StageRepo
 
 
+class PhenologyItem(NamedTuple):
+    """A phenology rule held in memory for verification."""
+    org_group: OrgGroupItem
+    stage: str
+    synonyms: frozenset[str]
+    start_day: int
+    start_month: int
+    end_day: int
+    end_month: int
+
+
 class PhenologyRuleRepo(RuleRepoBase):
     default_file = 'periodwithinyear.csv'
 
@@ -199,55 +213,103 @@ class PhenologyRuleRepo(RuleRepoBase):
 
         return errors
 
-    def run(self, record: Verified, org_group_id: int | None = None):
+    def get_rules(self, organism_keys: list[str] | None = None):
+        """Get the rules for a batch of taxa, or all taxa if None.
+
+        Returns a dictionary, keyed by organism_key, of lists of
+        PhenologyItem. Taxa without rules are omitted."""
+        rules = {}
+        for batch in self.batches(organism_keys):
+            # Left join synonyms as 'everything' rule won't have them.
+            query = (
+                select(PhenologyRule, OrgGroup, Stage, StageSynonym.synonym)
+                .select_from(PhenologyRule)
+                .join(OrgGroup, OrgGroup.id == PhenologyRule.org_group_id)
+                .join(Stage, Stage.id == PhenologyRule.stage_id)
+                .join(StageSynonym, isouter=True)
+                .order_by(OrgGroup.organisation, OrgGroup.group)
+            )
+            if batch is not None:
+                query = query.where(PhenologyRule.organism_key.in_(batch))
+            results = self.db.exec(query).all()
+
+            # Collect the synonyms of each rule from the joined rows.
+            collated = {}
+            for phenology_rule, org_group, stage, synonym in results:
+                if phenology_rule.id not in collated:
+                    collated[phenology_rule.id] = (
+                        phenology_rule, org_group, stage, set()
+                    )
+                if synonym is not None:
+                    collated[phenology_rule.id][3].add(synonym)
+
+            for phenology_rule, org_group, stage, stage_synonyms in (
+                collated.values()
+            ):
+                rules.setdefault(phenology_rule.organism_key, []).append(
+                    PhenologyItem(
+                        OrgGroupItem.from_org_group(org_group),
+                        stage.stage,
+                        frozenset(stage_synonyms),
+                        phenology_rule.start_day,
+                        phenology_rule.start_month,
+                        phenology_rule.end_day,
+                        phenology_rule.end_month
+                    )
+                )
+
+        return rules
+
+    def run(
+        self,
+        record: Verified,
+        org_group_id: int | None = None,
+        rules: list[PhenologyItem] | None = None
+    ):
         """Run rules against record, optionally filter rules by org_group.
 
         Returns a tuple of (ok, messages) where ok indicates test success
-        and messages is a list of details. If there are no rules, ok is None"""
+        and messages is a list of details. If there are no rules, ok is None.
+
+        The rules for the taxon of the record, as returned by get_rules(), can
+        be supplied to save querying the database."""
 
         ok = True
         messages = []
 
-        query = (
-            select(PhenologyRule, OrgGroup, Stage)
-            .select_from(PhenologyRule)
-            .join(OrgGroup, OrgGroup.id == PhenologyRule.org_group_id)
-            .join(Stage, Stage.id == PhenologyRule.stage_id)
-            .where(PhenologyRule.organism_key == record.organism_key)
-        )
+        if rules is None:
+            rules = self.get_rules(
+                [record.organism_key]).get(record.organism_key, [])
         if org_group_id is not None:
-            query = query.where(OrgGroup.id == org_group_id)
+            rules = [
+                rule for rule in rules if rule.org_group.id == org_group_id
+            ]
 
         if record.stage is None:
             # Use mature or 'everything' rule if no stage is specified.
             # No need to look at synonmms.
-            query = query.where(or_(
-                Stage.stage == 'mature',
-                Stage.stage == '*'))
+            rules = [
+                rule for rule in rules if rule.stage in ('mature', '*')
+            ]
         else:
             # Use rule with matching stage synonym or 'everything' rule.
-            # Left join synonyms as 'everything' rule won't have them.
-            query = (
-                query
-                .join(StageSynonym, isouter=True)
-                .where(or_(
-                    StageSynonym.synonym == record.stage,
-                    Stage.stage == '*'))
-            )
+            rules = [
+                rule for rule in rules
+                if record.stage in rule.synonyms or rule.stage == '*'
+            ]
 
-        rules = self.db.exec(query).all()
         # Do we have any rules?
         if len(rules) == 0:
             return None, []
 
-        for phenology_rule, org_group, stage in rules:
+        for rule in rules:
             # Apply the rule we have found.
-            result = self.test(record, phenology_rule)
+            result = self.test(record, rule)
             if result is not None:
                 ok = False
                 messages.append(
-                    f"{org_group.organisation}:{org_group.group}:phenology:"
-                    f"{stage.stage}:{result}"
+                    f"{rule.org_group.organisation}:{rule.org_group.group}:"
+                    f"phenology:{rule.stage}:{result}"
                 )
 
         return ok, messages
@@ -20,6 +20,7 @@ from .difficulty.difficulty_rule_repo import DifficultyRuleRepo
 from .org_group.org_group_repo import OrgGroupRepo
 from .period.period_repo import PeriodRuleRepo
 from .phenology.phenology_repo import PhenologyRuleRepo
+from .rule_snapshot import RuleSnapshot
 from .stage.stage_repo import StageRepo
 from .tenkm.tenkm_repo import TenkmRuleRepo
 
@@ -89,6 +90,8 @@ class RuleRepo:
     def __init__(self, db: Session, env: EnvSettings):
         self.db = db
         self.env = env
+        # Rules fetched by load_rules(), keyed by rule type then organism_key.
+        self.rules = None
 
         # Determine absolute path to the parent folder containing the data
         # directory. It may be specified relative to the application directory
@@ -152,6 +155,8 @@ class RuleRepo:
             self.rules_commit = self.git_update(settings)
             result = self.db_update(settings, full)
             result['commit'] = self.rules_commit
+            # Swap in the new rules for verification.
+            self.publish_snapshot(self.rules_commit, self.loading_time)
             logger.info("Rule update complete.")
             # Save update time to database.
             settings.db.rules_update_time = self.loading_time
@@ -420,6 +425,41 @@ class RuleRepo:
 
         return result
 
+    def load_rules(self, organism_keys: List[str]):
+        """Fetch the rules of every type for a batch of taxa.
+
+        One query per rule type fetches the rules for all the organism_keys.
+        Subsequent calls to run_difficulty() and run_rules() then test records
+        against the rules in memory rather than querying the database."""
+        self.rules = {
+            'difficulty': DifficultyRuleRepo(self.db, self.env).get_rules(
+                organism_keys)
+        }
+        for rule, rule_repo_class in self.verification_rule_types.items():
+            repo = rule_repo_class(self.db, self.env)
+            self.rules[rule] = repo.get_rules(organism_keys)
+
+    def use_snapshot(self, snapshot: RuleSnapshot):
+        """Test records against the rules in a snapshot.
+
+        Subsequent calls to run_difficulty() and run_rules() read rules from
+        the snapshot and never query the database."""
+        self.rules = snapshot.rules
+
+    def publish_snapshot(self, commit: str, update_time: str):
+        """Build a snapshot of the rules in the database and publish it."""
+        snapshot = RuleSnapshot.build(self.db, self.env, commit, update_time)
+        RuleSnapshot.publish(snapshot)
+
+    def get_loaded_rules(self, rule: str, organism_key: str):
+        """Return loaded rules of a type for a taxon.
+
+        Returns None if neither load_rules() nor use_snapshot() has been
+        called so that the rule repo will query the database."""
+        if self.rules is None:
+            return None
+        return self.rules[rule].get(organism_key, [])
+
     def run_rules(
         self,
         org_group_rules_list: List,
@@ -450,7 +490,11 @@ class RuleRepo:
             # Try all the rules
             for rule, rule_repo_class in self.verification_rule_types.items():
                 repo = rule_repo_class(self.db, self.env)
-                ok, messages = repo.run(record, org_group_id)
+                ok, messages = repo.run(
+                    record,
+                    org_group_id,
+                    self.get_loaded_rules(rule, record.organism_key)
+                )
                 if ok is not None:
                     # Rule has run.
                     ok_overall = ok_overall and ok
@@ -464,7 +508,11 @@ class RuleRepo:
                     raise ValueError(f"Unrecognised rule type, '{rule}'")
                 rule_repo_class = self.verification_rule_types[rule]
                 repo = rule_repo_class(self.db, self.env)
-                ok, messages = repo.run(record, org_group_id)
+                ok, messages = repo.run(
+                    record,
+                    org_group_id,
+                    self.get_loaded_rules(rule, record.organism_key)
+                )
                 if ok is not None:
                     # Rule has run.
                     ok_overall = ok_overall and ok
@@ -493,10 +541,13 @@ class RuleRepo:
         Updates record with id_difficulty and messages. Difficulty text
         messages are suppressed if verbose is False."""
         difficulty_repo = DifficultyRuleRepo(self.db, self.env)
+        rules = self.get_loaded_rules('difficulty', record.organism_key)
 
         if len(org_group_rules_list) == 0:
             # Use difficulty from all org_groups.
-            id_difficulty, messages = difficulty_repo.run(record, verbose)
+            id_difficulty, messages = difficulty_repo.run(
+                record, verbose, rules=rules
+            )
             if id_difficulty is None:
                 record.result = 'warn'
                 messages.append("No rules exist for this taxon.")
@@ -508,7 +559,7 @@ class RuleRepo:
                 org_group = org_group_rules['org_group']
 
                 id_difficulty, messages = difficulty_repo.run(
-                    record, verbose, org_group.id
+                    record, verbose, org_group.id, rules
                 )
                 if id_difficulty is None:
                     record.result = 'warn'
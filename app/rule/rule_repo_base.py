@@ -7,6 +7,9 @@ from app.settings_env import EnvSettings
 
 
 class RuleRepoBase:
+    # The maximum number of organism keys in a single IN (...) query. This
+    # stays well within the SQLite limit on variables in a statement.
+    batch_size = 5000
 
     def __init__(self, db: Session, env: EnvSettings):
         self.db = db
@@ -24,3 +27,16 @@ class RuleRepoBase:
             )
         else:
             return None
+
+    def batches(self, organism_keys: list[str] | None):
+        """Split a list of organism keys into batches for querying.
+
+        If organism_keys is None, a single batch of None is returned,
+        indicating that all taxa are wanted."""
+        if organism_keys is None:
+            yield None
+            return
+
+        organism_keys = list(dict.fromkeys(organism_keys))
+        for i in range(0, len(organism_keys), self.batch_size):
+            yield organism_keys[i:i + self.batch_size]
@@ -0,0 +1,107 @@
+import logging
+from types import MappingProxyType
+
+from sqlmodel import Session
+
+from app.settings_env import EnvSettings
+
+from .additional.additional_rule_repo import AdditionalRuleRepo
+from .difficulty.difficulty_rule_repo import DifficultyRuleRepo
+from .org_group.org_group_repo import OrgGroupItem, OrgGroupRepo
+from .period.period_repo import PeriodRuleRepo
+from .phenology.phenology_repo import PhenologyRuleRepo
+from .tenkm.tenkm_repo import TenkmRuleRepo
+
+logger = logging.getLogger(f"uvicorn.{__name__}")
+
+
+class RuleSnapshot:
+    """A read-only, in-memory copy of all the rules used for verification.
+
+    A snapshot is built from the database after the rules are loaded and then
+    published, replacing the previous snapshot with a single assignment.
+    Verification only reads rules from the published snapshot so it never
+    contends with the rule loader for the database."""
+
+    # Repository classes from which the rules of each type are obtained.
+    rule_types = {
+        'difficulty': DifficultyRuleRepo,
+        'additional': AdditionalRuleRepo,
+        'period': PeriodRuleRepo,
+        'phenology': PhenologyRuleRepo,
+        'tenkm': TenkmRuleRepo
+    }
+
+    # The snapshot currently in use. It is replaced but never modified.
+    _current = None
+
+    def __init__(
+        self,
+        commit: str = '',
+        update_time: str = '',
+        org_groups: list[OrgGroupItem] | None = None,
+        rules: dict | None = None
+    ):
+        if org_groups is None:
+            org_groups = []
+        if rules is None:
+            rules = {}
+
+        # The commit of the rules repo from which the rules came.
+        self.commit = commit
+        # The time at which the rules were loaded.
+        self.update_time = update_time
+        # OrgGroupItems keyed by id.
+        self.org_groups = MappingProxyType(
+            {org_group.id: org_group for org_group in org_groups}
+        )
+        # OrgGroupItems keyed by (organisation, group).
+        self.org_group_names = MappingProxyType({
+            (org_group.organisation, org_group.group): org_group
+            for org_group in org_groups
+        })
+        # Tuples of rule items keyed by rule type then organism_key.
+        self.rules = MappingProxyType({
+            rule: MappingProxyType({
+                organism_key: tuple(items)
+                for organism_key, items in rules.get(rule, {}).items()
+            })
+            for rule in self.rule_types
+        })
+
+    @classmethod
+    def build(
+        cls,
+        db: Session,
+        env: EnvSettings,
+        commit: str = '',
+        update_time: str = ''
+    ):
+        """Build a snapshot of all the rules in the database."""
+        org_groups = [
+            OrgGroupItem.from_org_group(org_group)
+            for org_group in OrgGroupRepo(db).list()
+        ]
+        rules = {}
+        for rule, rule_repo_class in cls.rule_types.items():
+            rules[rule] = rule_repo_class(db, env).get_rules()
+
+        return cls(commit, update_time, org_groups, rules)
+
+    @classmethod
+    def publish(cls, snapshot: 'RuleSnapshot'):
+        """Make the snapshot the one used for verification."""
+        cls._current = snapshot
+        logger.info(f"Rule snapshot of commit '{snapshot.commit}' published.")
+
+    @classmethod
+    def current(cls) -> 'RuleSnapshot':
+        """Return the snapshot in use, or an empty one if none published."""
+        snapshot = cls._current
+        if snapshot is None:
+            snapshot = cls()
+        return snapshot
+
+    def get_org_group(self, organisation: str, group: str):
+        """Return the OrgGroupItem with given names or None if unknown."""
+        return self.org_group_names.get((organisation, group))
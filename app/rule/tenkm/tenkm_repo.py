@@ -1,4 +1,6 @@
 import re
+from typing import NamedTuple
+
 import pandas as pd
 
 from sqlmodel import select
@@ -9,9 +11,17 @@ from app.sqlmodels import TenkmRule, Taxon, OrgGroup
 from app.utility.sref.grid_utils import GridUtils
 from app.verify.verify_models import Verified
 
+from ..org_group.org_group_repo import OrgGroupItem
 from ..rule_repo_base import RuleRepoBase
 
 
+class TenkmItem(NamedTuple):
+    """A tenkm rule held in memory for verification."""
+    org_group: OrgGroupItem
+    km100: str
+    km10s: frozenset[str]
+
+
 class TenkmRuleRepo(RuleRepoBase):
     default_file = 'tenkm.csv'
 
@@ -155,54 +165,88 @@ class TenkmRuleRepo(RuleRepoBase):
 
         return list(errors)
 
-    def run(self, record: Verified, org_group_id: int | None = None):
+    def get_rules(self, organism_keys: list[str] | None = None):
+        """Get the rules for a batch of taxa, or all taxa if None.
+
+        Returns a dictionary, keyed by organism_key, of lists of TenkmItem.
+        Taxa without rules are omitted."""
+        rules = {}
+        for batch in self.batches(organism_keys):
+            query = (
+                select(TenkmRule, OrgGroup)
+                .join(OrgGroup)
+                .order_by(OrgGroup.organisation, OrgGroup.group)
+            )
+            if batch is not None:
+                query = query.where(TenkmRule.organism_key.in_(batch))
+            results = self.db.exec(query).all()
+
+            for tenkm_rule, org_group in results:
+                rules.setdefault(tenkm_rule.organism_key, []).append(
+                    TenkmItem(
+                        OrgGroupItem.from_org_group(org_group),
+                        tenkm_rule.km100,
+                        frozenset(tenkm_rule.km10.split())
+                    )
+                )
+
+        return rules
+
+    def run(
+        self,
+        record: Verified,
+        org_group_id: int | None = None,
+        rules: list[TenkmItem] | None = None
+    ):
         """Run rules against record, optionally filter rules by org_group.
 
         Args:
             record (Verified): The record being tested.
             org_group_id (int): Optional id of org_group from which to select 
             rules.
+            rules (list[TenkmItem]): Optional rules for the taxon of the
+            record, as returned by get_rules(), to save querying the database.
         Returns
             tuple[bool, list[str]]: of (ok, messages) where ok indicates test 
             success and messages is a list of details. If there are no rules, 
             ok is None.
         """
 
-        # Get the org_groups having rules for the taxon.
-        query = (
-            select(OrgGroup)
-            .select_from(TenkmRule)
-            .distinct()
-            .join(OrgGroup)
-            .where(TenkmRule.organism_key == record.organism_key)
-            .order_by(OrgGroup.organisation, OrgGroup.group)
-        )
-        if org_group_id is not None:
-            query = query.where(OrgGroup.id == org_group_id)
+        if rules is None:
+            rules = self.get_rules(
+                [record.organism_key]).get(record.organism_key, [])
+
+        # Collate the distribution of the taxon for each org_group having
+        # rules. A distribution is a dictionary of km10s keyed by km100.
+        distributions = {}
+        for rule in rules:
+            if org_group_id is None or rule.org_group.id == org_group_id:
+                distribution = distributions.setdefault(rule.org_group, {})
+                distribution[rule.km100] = rule.km10s
 
         # Do we have any rules?
-        org_groups = self.db.exec(query).all()
-        if len(org_groups) == 0:
+        if len(distributions) == 0:
             # No we don't.
             return None, []
 
         # Test the record
-        ok, messages = self.test_recorded_10km(record, org_groups)
+        ok, messages = self.test_recorded_10km(record, distributions)
 
         if not ok and self.env.tenkm_tolerance > 0:
             # Test the squares in the tolerance band
             ok, messages = self.test_surrounding_10kms(
-                record, org_groups
+                record, distributions
             )
 
         return ok, messages
 
-    def test_recorded_10km(self, record: Verified, org_groups: list[OrgGroup]):
+    def test_recorded_10km(self, record: Verified, distributions: dict):
         """Run rules from org_groups against record.
 
         Args:
             record (Verified): The record being tested.
-            org_groups (int): List of OrgGroup from which to select rules.
+            distributions (dict): Distribution of the taxon keyed by
+            OrgGroupItem.
         Returns
             tuple[bool, list[str]]: of (ok, messages) where ok indicates test 
             success and messages is a list of details.
@@ -211,10 +255,9 @@ class TenkmRuleRepo(RuleRepoBase):
 
         km100 = record.sref.km100
         km10 = record.sref.km10
-        organism_key = record.organism_key
         # Try the rules from each org_group.
-        for org_group in org_groups:
-            ok, message = self.test(km100, km10, org_group, organism_key)
+        for org_group, distribution in distributions.items():
+            ok, message = self.test(km100, km10, org_group, distribution)
             if not ok:
                 messages.append(message)
 
@@ -226,13 +269,14 @@ class TenkmRuleRepo(RuleRepoBase):
 
     def test_surrounding_10kms(
         self, record: Verified,
-        org_groups: list[OrgGroup]
+        distributions: dict
     ):
         """Run rules from org_groups against squares around record.
 
         Args:
             record (Verified): The record being tested.
-            org_groups (int): List of OrgGroup from which to select rules.
+            distributions (dict): Distribution of the taxon keyed by
+            OrgGroupItem.
         Returns
             tuple[bool, list[str]]: of (ok, messages) where ok indicates test 
             success and messages is a list of details.
@@ -244,17 +288,16 @@ class TenkmRuleRepo(RuleRepoBase):
         surrounding_km10s = utils.get_surrounding_km10s(
             record_km10, self.env.tenkm_tolerance
         )
-        organism_key = record.organism_key
 
         # Try the rules from each org_group.
-        for org_group in org_groups:
+        for org_group, distribution in distributions.items():
             # Try the rules for each surrounding square
             for surrounding_km10 in surrounding_km10s:
                 l = len(surrounding_km10)
                 km10 = surrounding_km10[l-2: l]
                 km100 = surrounding_km10[0: l-2]
 
-                ok, message = self.test(km100, km10, org_group, organism_key)
+                ok, message = self.test(km100, km10, org_group, distribution)
                 if ok:
                     # A surrounding square passed a test.
                     messages.append(
@@ -279,14 +322,20 @@ class TenkmRuleRepo(RuleRepoBase):
             # No messages indicates outright failure.
             return False, []
 
-    def test(self, km100: str, km10: str, org_group: OrgGroup, organism_key: str):
+    def test(
+        self,
+        km100: str,
+        km10: str,
+        org_group: OrgGroupItem,
+        distribution: dict
+    ):
         """Run org_group rules against taxon and location.
 
         Args:
             km100 (str): The letter(s) indicating 100km square.
             km10 (str): The two digits indicaing 10km square within km100.
-            org_group (OrgGroup): The OrgGroup with the rules.
-            organism_key (str): The organism_key identifying the taxon.
+            org_group (OrgGroupItem): The OrgGroup with the rules.
+            distribution (dict): The km10s of the taxon keyed by km100.
         Returns:
             tuple[bool, str]: (ok, message) where ok indicates test success
             and message has details details. If there are no rules, ok is
@@ -294,22 +343,13 @@ class TenkmRuleRepo(RuleRepoBase):
         ok = True
         message = ''
 
-        query = (
-            select(TenkmRule)
-            .where(TenkmRule.organism_key == organism_key)
-            .where(TenkmRule.km100 == km100)
-            .where(TenkmRule.org_group_id == org_group.id)
-        )
-        tenkm_rule = self.db.exec(query).one_or_none()
-
-        if tenkm_rule is None:
+        km10s = distribution.get(km100)
+        if km10s is None:
             # No matching km100 in the rules.
             ok = False
-        else:
-            km10s = tenkm_rule.km10.split()
-            if (km10 not in km10s):
-                # No matching km10 in the rules.
-                ok = False
+        elif km10 not in km10s:
+            # No matching km10 in the rules.
+            ok = False
 
         if not ok:
             message = (
@@ -0,0 +1,138 @@
+from typing import List, Optional
+
+from sqlmodel import Session
+
+from app.rule.rule_repo import RuleRepo
+from app.rule.rule_snapshot import RuleSnapshot
+from app.settings_env import EnvSettings
+import app.species.cache as cache
+from app.utility.sref.sref_factory import SrefFactory
+from app.utility.vague_date import VagueDate
+
+from .verify_models import OrgGroupRules, Verify, Verified
+
+
+class VerifyEngine:
+    """Verifies batches of records.
+
+    Each record in a batch is first checked and formatted before being tested
+    against the rules in memory. The rules come from the snapshot published
+    when the engine is created so that every record is tested against the
+    same commit of the rules, even if an update completes part way through."""
+
+    def __init__(
+        self,
+        db: Session,
+        env: EnvSettings,
+        org_group_rules_list: Optional[List[OrgGroupRules]] = None,
+        verbose: bool = True
+    ):
+        self.db = db
+        self.env = env
+        self.org_group_rules_list = org_group_rules_list
+        self.verbose = verbose
+        self.snapshot = RuleSnapshot.current()
+
+    def verify(self, records: List[Verify]) -> List[Verified]:
+        """Verify a batch of records, returning results in the same order."""
+        results = []
+        # Records which pass preparation, paired with the org_groups and
+        # rules to test them against.
+        prepared = []
+
+        for record in records:
+            # Our response begins with the input data.
+            verified = Verified(**record.model_dump())
+
+            # Since we expect valid data, bail out at the first error
+            # to save processing time.
+            try:
+                org_group_rules_list = self.prepare(record, verified)
+                prepared.append((verified, org_group_rules_list))
+            except (Exception) as e:
+                verified.result = 'fail'
+                verified.messages.append(str(e))
+            finally:
+                # Accumulate results.
+                results.append(verified)
+
+        repo = RuleRepo(self.db, self.env)
+        repo.use_snapshot(self.snapshot)
+
+        for verified, org_group_rules_list in prepared:
+            try:
+                # 6. Get id difficulty.
+                repo.run_difficulty(
+                    org_group_rules_list, verified, self.verbose
+                )
+
+                # 7. Check against rules.
+                if verified.id_difficulty is not None:
+                    repo.run_rules(org_group_rules_list, verified)
+
+                # Order the messages for clarity and testability.
+                verified.messages.sort()
+
+            except (Exception) as e:
+                verified.result = 'fail'
+                verified.messages.append(str(e))
+
+        return results
+
+    def prepare(self, record: Verify, verified: Verified) -> list:
+        """Check and format a record ready for testing against rules.
+
+        Updates verified with the taxon, date, sref and stage. Returns the
+        list of org_groups and rules to test the record against. Raises an
+        exception if the record is invalid."""
+
+        # 1. Get preferred TVK.
+        if not record.tvk and not record.name:
+            raise ValueError("TVK or name required.")
+        if record.tvk:
+            # Use TVK if provided as not ambiguous.
+            taxon = cache.get_taxon_by_tvk(self.db, self.env, record.tvk)
+            if not record.name:
+                verified.name = taxon.name
+            elif record.name != taxon.name:
+                raise ValueError(
+                    f"Name does not match TVK. Expected {taxon.name}.")
+        else:
+            # Otherwise use name.
+            taxon = cache.get_taxon_by_name(self.db, self.env, record.name)
+            verified.tvk = taxon.tvk
+
+        verified.preferred_tvk = taxon.preferred_tvk
+        verified.organism_key = taxon.organism_key
+
+        # 2. Format date.
+        vague_date = VagueDate(record.date)
+        verified.date = str(vague_date)
+
+        # 3. Obtain gridref.
+        functional_sref = SrefFactory(record.sref)
+        verified.sref = functional_sref.value
+
+        # 4. Format stage
+        if record.stage is not None:
+            verified.stage = record.stage.strip().lower()
+
+        # 5. Look up org_groups and create new list of org_groups & rules.
+        new_org_group_rules_list = []
+        if self.org_group_rules_list is not None:
+            for org_group_rules in self.org_group_rules_list:
+                organisation = org_group_rules.organisation
+                group = org_group_rules.group
+                rules = org_group_rules.rules
+                org_group = self.snapshot.get_org_group(organisation, group)
+                if org_group is None:
+                    raise ValueError(
+                        "Unrecognised organisation:group, "
+                        f"'{organisation}:{group}'."
+                    )
+                new_org_group_rules_list.append({
+                    "org_group": org_group,
+                    "rules": rules
+                })
+
+        return new_org_group_rules_list
@@ -38,3 +38,13 @@ class VerifiedPack(BaseModel):
     duration_ns: int
     rules_commit: str
     rules_update_time: str
+
+
+class VerifyStreamHeader(BaseModel):
+    org_group_rules_list: Optional[List[OrgGroupRules]] = None
+
+
+class VerifyStreamTrailer(BaseModel):
+    duration_ns: int
+    rules_commit: str
+    rules_update_time: str
@@ -1,18 +1,17 @@
 import time
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
 
 from app.auth import UserDependency
 from app.database import DbDependency
-from app.rule.org_group.org_group_repo import OrgGroupRepo
-from app.rule.rule_repo import RuleRepo
 from app.settings import SettingsDependency
-import app.species.cache as cache
 from app.usage.usage_repo import UsageRepo
-from app.utility.sref.sref_factory import SrefFactory
-from app.utility.vague_date import VagueDate
 
-from .verify_models import VerifyPack, Verified, VerifiedPack
+from .verify_engine import VerifyEngine
+from .verify_models import VerifyPack, VerifiedPack
+from .verify_stream import VerifyStream
 
 
 router = APIRouter(
@@ -57,84 +56,10 @@ async def verify(
     # might offer more control. For now it is used as a boolean internally.
 
     start = time.time_ns()
-    env = settings.env
-    results = []
-    for record in data.records:
-        # Our response begins with the input data.
-        verified = Verified(**record.model_dump())
-
-        # Since we expect valid data, bail out at the first error
-        # to save processing time.
-        try:
-            # 1. Get preferred TVK.
-            if not record.tvk and not record.name:
-                raise ValueError("TVK or name required.")
-            if record.tvk:
-                # Use TVK if provided as not ambiguous.
-                taxon = cache.get_taxon_by_tvk(db, env, record.tvk)
-                if not record.name:
-                    verified.name = taxon.name
-                elif record.name != taxon.name:
-                    raise ValueError(
-                        f"Name does not match TVK. Expected {taxon.name}.")
-            else:
-                # Otherwise use name.
-                taxon = cache.get_taxon_by_name(db, env, record.name)
-                verified.tvk = taxon.tvk
-
-            verified.preferred_tvk = taxon.preferred_tvk
-            verified.organism_key = taxon.organism_key
-
-            # 2. Format date.
-            vague_date = VagueDate(record.date)
-            verified.date = str(vague_date)
-
-            # 3. Obtain gridref.
-            functional_sref = SrefFactory(record.sref)
-            verified.sref = functional_sref.value
-
-            # 4. Format stage
-            if record.stage is not None:
-                verified.stage = record.stage.strip().lower()
-
-            # 5. Look up org_groups and create new list of org_groups & rules.
-            new_org_group_rules_list = []
-            if data.org_group_rules_list is not None:
-                org_group_repo = OrgGroupRepo(db)
-                for org_group_rules in data.org_group_rules_list:
-                    organisation = org_group_rules.organisation
-                    group = org_group_rules.group
-                    rules = org_group_rules.rules
-                    org_group = org_group_repo.get(organisation, group)
-                    if org_group is None:
-                        raise ValueError(
-                            "Unrecognised organisation:group, "
-                            f"'{organisation}:{group}'."
-                        )
-                    new_org_group_rules_list.append({
-                        "org_group": org_group,
-                        "rules": rules
-                    })
-
-            # 6. Get id difficulty.
-            repo = RuleRepo(db, env)
-            repo.run_difficulty(
-                new_org_group_rules_list, verified, bool(verbose)
-            )
-
-            # 7. Check against rules.
-            if verified.id_difficulty is not None:
-                repo.run_rules(new_org_group_rules_list, verified)
-
-            # Order the messages for clarity and testability.
-            verified.messages.sort()
-
-        except (Exception) as e:
-            verified.result = 'fail'
-            verified.messages.append(str(e))
-        finally:
-            # Accumulate results.
-            results.append(verified)
+    engine = VerifyEngine(
+        db, settings.env, data.org_group_rules_list, bool(verbose)
+    )
+    results = engine.verify(data.records)
 
     duration = time.time_ns() - start
 
@@ -145,6 +70,55 @@ async def verify(
         org_group_rules_list=data.org_group_rules_list,
         records=results,
         duration_ns=duration,
-        rules_commit=settings.db.rules_commit,
-        rules_update_time=settings.db.rules_update_time
+        rules_commit=engine.snapshot.commit,
+        rules_update_time=engine.snapshot.update_time
     )
+
+
+@router.post(
+    "/verify/stream",
+    summary="Verify a stream of records.",
+    response_class=StreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "application/json": {"schema": {"type": "array"}}
+            }
+        }
+    })
+async def verify_stream(
+    request: Request,
+    settings: SettingsDependency,
+    user: UserDependency,
+    verbose: int = 1,
+):
+    """ Verify a stream of records, returning results as they are produced.
+
+    This is an alternative to the /verify endpoint for large numbers of
+    records. The body is either newline-delimited JSON (NDJSON) with one
+    record per line, or a JSON array of records. The fields of a record are
+    the same as for /verify. If it is desired to only use specific rules then
+    the first line, or array element, may instead be an object containing an
+    **org_group_rules_list**.
+
+    The response is NDJSON with one line per record, in the order received,
+    which is written as soon as the record has been verified. An item which
+    is not a valid record results in a line with its position in the input,
+    **item**, and the reason, **detail**. The last line holds the
+    **duration_ns**, **rules_commit** and **rules_update_time**.
+
+    Setting the verbose parameter to 0 will reduce message output."""
+
+    async def generate():
+        # The session must outlive the request handler so is created here.
+        with Session(request.state.engine) as db:
+            stream = VerifyStream(db, settings.env, bool(verbose))
+            async for line in stream.run(request.stream()):
+                yield line
+
+            repo = UsageRepo(db)
+            repo.update_verification_usage(user.name, stream.count)
+
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
@@ -0,0 +1,221 @@
+import codecs
+import json
+import time
+from collections.abc import AsyncIterator
+
+from pydantic import ValidationError
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.settings_env import EnvSettings
+
+from .verify_engine import VerifyEngine
+from .verify_models import Verify, VerifyStreamHeader, VerifyStreamTrailer
+
+
+class JsonItemReader:
+    """Splits a body, arriving in chunks, into JSON items.
+
+    The body may either be a JSON array or newline-delimited JSON (NDJSON),
+    which is decided by the first character. Items are returned as soon as
+    they are complete so the whole body never has to be held in memory.
+
+    A line of NDJSON which cannot be decoded is returned as a ValueError so
+    that the remaining lines can still be processed. An error in the syntax
+    of an array is raised as there is no way to resume."""
+
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ''
+        # Either 'array' or 'ndjson' once the first character is seen.
+        self.mode = None
+        # In an array, what may come next: 'first' a value or the end,
+        # 'value' a value, 'separator' a comma or the end, 'none' nothing.
+        self.expect = 'first'
+
+    def feed(self, data: bytes, final: bool = False) -> list:
+        """Add data to the buffer and return any items now complete.
+
+        Call with final True after the last chunk of data."""
+        self.buffer += self.decoder.decode(data, final)
+
+        if self.mode is None:
+            stripped = self.buffer.lstrip()
+            if stripped == '':
+                return []
+            if stripped[0] == '[':
+                self.mode = 'array'
+                self.buffer = stripped[1:]
+            else:
+                self.mode = 'ndjson'
+
+        if self.mode == 'ndjson':
+            return self.read_lines(final)
+        else:
+            return self.read_array(final)
+
+    def read_lines(self, final: bool) -> list:
+        lines = self.buffer.split('\n')
+        # Keep any incomplete last line until more data arrives.
+        self.buffer = '' if final else lines.pop()
+
+        items = []
+        for line in lines:
+            if line.strip() == '':
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(ValueError(f"Invalid JSON. {e}"))
+        return items
+
+    def read_array(self, final: bool) -> list:
+        items = []
+        buffer = self.buffer
+        pos = 0
+        while True:
+            # Skip whitespace.
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if self.expect == 'none':
+                raise ValueError("Invalid JSON. Data after end of array.")
+            elif char == ']' and self.expect in ('first', 'separator'):
+                self.expect = 'none'
+                pos += 1
+            elif self.expect == 'separator':
+                if char != ',':
+                    raise ValueError(
+                        f"Invalid JSON. Expected ',' but found '{char}'.")
+                self.expect = 'value'
+                pos += 1
+            else:
+                try:
+                    item, pos = self.json_decoder.raw_decode(buffer, pos)
+                except ValueError as e:
+                    if final:
+                        raise ValueError(f"Invalid JSON. {e}")
+                    # Wait for the rest of the item to arrive.
+                    break
+                items.append(item)
+                self.expect = 'separator'
+
+        self.buffer = buffer[pos:]
+        if final and self.expect != 'none':
+            raise ValueError("Invalid JSON. Array is not closed.")
+        return items
+
+
+class VerifyStream:
+    """Verifies a stream of records, yielding lines of NDJSON.
+
+    Records are verified in batches of batch_size as they arrive and a line
+    is output for each item, in the order received. The first item may be a
+    header holding an org_group_rules_list. The final line is a trailer
+    holding the duration and rules metadata."""
+
+    # The number of records verified together.
+    batch_size = 100
+
+    def __init__(self, db: Session, env: EnvSettings, verbose: bool = True):
+        self.db = db
+        self.env = env
+        self.verbose = verbose
+        self.engine = None
+        # The number of items read from the input.
+        self.index = 0
+        # The number of records verified.
+        self.count = 0
+
+    async def run(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        """Yield lines of output for a body arriving in chunks."""
+        start = time.time_ns()
+        reader = JsonItemReader()
+        # Records waiting to be verified and lines reporting invalid items.
+        batch = []
+
+        try:
+            async for chunk in chunks:
+                self.add(reader.feed(chunk), batch)
+                if len(batch) >= self.batch_size:
+                    for line in await self.verify(batch):
+                        yield line
+                    batch = []
+            self.add(reader.feed(b'', final=True), batch)
+        except ValueError as e:
+            # The body can be read no further.
+            batch.append(self.error_line(self.index + 1, str(e)))
+
+        for line in await self.verify(batch):
+            yield line
+
+        if self.engine is None:
+            self.start_engine()
+        trailer = VerifyStreamTrailer(
+            duration_ns=time.time_ns() - start,
+            rules_commit=self.engine.snapshot.commit,
+            rules_update_time=self.engine.snapshot.update_time
+        )
+        yield trailer.model_dump_json() + '\n'
+
+    def add(self, items: list, batch: list):
+        """Add items to the batch, replacing invalid ones by an error line."""
+        for item in items:
+            self.index += 1
+            if isinstance(item, Exception):
+                batch.append(self.error_line(self.index, str(item)))
+            elif (
+                self.index == 1 and
+                isinstance(item, dict) and
+                'org_group_rules_list' in item
+            ):
+                try:
+                    header = VerifyStreamHeader.model_validate(item)
+                except ValidationError as e:
+                    raise ValueError(f"Invalid header. {e}")
+                self.start_engine(header.org_group_rules_list)
+            else:
+                try:
+                    batch.append(Verify.model_validate(item))
+                except ValidationError as e:
+                    batch.append(self.error_line(self.index, e.errors(
+                        include_url=False,
+                        include_context=False,
+                        include_input=False
+                    )))
+
+    def start_engine(self, org_group_rules_list=None):
+        self.engine = VerifyEngine(
+            self.db, self.env, org_group_rules_list, self.verbose
+        )
+
+    async def verify(self, batch: list) -> list[str]:
+        """Verify the records in a batch, returning a line for each item."""
+        if self.engine is None:
+            self.start_engine()
+
+        records = [item for item in batch if isinstance(item, Verify)]
+        if len(records) > 0:
+            # Verification makes blocking database calls.
+            results = iter(
+                await run_in_threadpool(self.engine.verify, records)
+            )
+            self.count += len(records)
+
+        lines = []
+        for item in batch:
+            if isinstance(item, Verify):
+                verified = next(results)
+                line = verified.model_dump_json(exclude_none=True)
+                lines.append(line + '\n')
+            else:
+                lines.append(item)
+        return lines
+
+    def error_line(self, index: int, detail: str | list) -> str:
+        """Return a line reporting an item which could not be verified."""
+        return json.dumps({'item': index, 'detail': detail}) + '\n'
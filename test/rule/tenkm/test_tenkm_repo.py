@@ -290,3 +290,76 @@ class TestTenkmRuleRepo:
         assert messages[0] == (
             "organisation1:group1:tenkm: Location is FAR FROM the known distribution."
         )
+
+    def test_get_rules(self, db: Session, env: EnvSettings):
+        # Create org_groups.
+        org_group1 = OrgGroup(organisation='organisation1', group='group1')
+        org_group2 = OrgGroup(organisation='organisation2', group='group2')
+        db.add(org_group1)
+        db.add(org_group2)
+        db.commit()
+
+        # Create tenkm rules for two taxa.
+        db.add(TenkmRule(
+            org_group_id=org_group2.id,
+            organism_key='NBNORG0000010513',
+            km100='TL',
+            km10='13 14',
+            coord_system='OSGB'
+        ))
+        db.add(TenkmRule(
+            org_group_id=org_group1.id,
+            organism_key='NBNORG0000010513',
+            km100='TM',
+            km10='99',
+            coord_system='OSGB'
+        ))
+        db.add(TenkmRule(
+            org_group_id=org_group1.id,
+            organism_key='NBNORG0000010514',
+            km100='J',
+            km10='11',
+            coord_system='OSNI'
+        ))
+        db.commit()
+
+        # Get rules for a batch of taxa, one of which has no rules.
+        repo = TenkmRuleRepo(db, env)
+        rules = repo.get_rules(
+            ['NBNORG0000010513', 'NBNORG0000010514', 'NBNORG0000010517']
+        )
+        assert len(rules) == 2
+        assert 'NBNORG0000010517' not in rules
+
+        # Rules are ordered by org_group.
+        rules1 = rules['NBNORG0000010513']
+        assert len(rules1) == 2
+        assert rules1[0].org_group.organisation == 'organisation1'
+        assert rules1[0].km100 == 'TM'
+        assert rules1[0].km10s == {'99'}
+        assert rules1[1].org_group.organisation == 'organisation2'
+        assert rules1[1].km100 == 'TL'
+        assert rules1[1].km10s == {'13', '14'}
+
+        rules2 = rules['NBNORG0000010514']
+        assert len(rules2) == 1
+        assert rules2[0].km100 == 'J'
+
+        # Test a record against the rules we fetched.
+        record = Verified(
+            id=1,
+            date='1/6/1975',
+            sref=SrefFactory(
+                Sref(gridref='TL1234', srid=SrefSystem.GB_GRID)
+            ).value,
+            organism_key='NBNORG0000010513'
+        )
+        ok, messages = repo.run(record, rules=rules1)
+        assert ok is False
+        assert messages == [
+            "organisation1:group1:tenkm: Location is outside known "
+            "distribution."
+        ]
+        ok, messages = repo.run(record, org_group2.id, rules1)
+        assert ok is True
+        assert messages == []
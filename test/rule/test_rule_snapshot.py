@@ -0,0 +1,62 @@
+import pytest
+from sqlmodel import Session
+
+from app.rule.rule_snapshot import RuleSnapshot
+from app.settings_env import EnvSettings
+from app.sqlmodels import OrgGroup, TenkmRule
+
+
+class TestRuleSnapshot:
+
+    def test_build(self, db: Session, env: EnvSettings):
+        # Create an org_group with a rule.
+        org_group = OrgGroup(organisation='organisation1', group='group1')
+        db.add(org_group)
+        db.commit()
+        db.refresh(org_group)
+        db.add(TenkmRule(
+            org_group_id=org_group.id,
+            organism_key='NBNORG0000010513',
+            km100='TL',
+            km10='14 15',
+            coord_system='OSGB'
+        ))
+        db.commit()
+
+        snapshot = RuleSnapshot.build(db, env, 'abc123', '2026-01-01')
+        assert snapshot.commit == 'abc123'
+        assert snapshot.update_time == '2026-01-01'
+
+        item = snapshot.get_org_group('organisation1', 'group1')
+        assert item.id == org_group.id
+        assert snapshot.get_org_group('organisation1', 'group2') is None
+
+        rules = snapshot.rules['tenkm']['NBNORG0000010513']
+        assert len(rules) == 1
+        assert rules[0].org_group == item
+        assert rules[0].km100 == 'TL'
+        assert rules[0].km10s == frozenset(['14', '15'])
+        assert snapshot.rules['period'] == {}
+
+        # The snapshot cannot be modified.
+        with pytest.raises(TypeError):
+            snapshot.rules['tenkm']['NBNORG0000010514'] = ()
+
+    def test_publish(self, db: Session, env: EnvSettings):
+        snapshot = RuleSnapshot.build(db, env, 'abc123', '2026-01-01')
+        RuleSnapshot.publish(snapshot)
+        assert RuleSnapshot.current() is snapshot
+
+        # Changes to the database are not seen until a new snapshot is
+        # published.
+        org_group = OrgGroup(organisation='organisation1', group='group1')
+        db.add(org_group)
+        db.commit()
+        assert RuleSnapshot.current().get_org_group(
+            'organisation1', 'group1') is None
+
+        snapshot = RuleSnapshot.build(db, env, 'def456', '2026-01-02')
+        RuleSnapshot.publish(snapshot)
+        assert RuleSnapshot.current().commit == 'def456'
+        assert RuleSnapshot.current().get_org_group(
+            'organisation1', 'group1') is not None
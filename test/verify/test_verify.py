@@ -3,6 +3,7 @@ from datetime import datetime
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app.rule.rule_repo import RuleRepo
 from app.sqlmodels import (
     OrgGroup,
     Taxon,
@@ -15,6 +16,16 @@ from app.verify.verify_models import VerifyPack, OrgGroupRules
 from ..mocks import mock_make_search_request
 
 
+def publish_rules(client: TestClient):
+    """Publish a snapshot of the rules in the database for verification."""
+    settings = client.app.context['settings']
+    engine = client.app.context['engine']
+    with Session(engine) as db:
+        RuleRepo(db, settings.env).publish_snapshot(
+            settings.db.rules_commit, settings.db.rules_update_time
+        )
+
+
 class TestVerify:
 
     def test_no_records(self, client: TestClient):
@@ -25,6 +36,7 @@ class TestVerify:
         settings = client.app.context['settings']
         settings.db.rules_commit = 'test123'
         settings.db.rules_update_time = '2026-02-23 16:59:59'
+        publish_rules(client)
 
         response = client.post(
             '/verify',
@@ -41,6 +53,7 @@ class TestVerify:
         settings = client.app.context['settings']
         settings.db.rules_commit = 'test123'
         settings.db.rules_update_time = '2026-02-23 16:59:59'
+        publish_rules(client)
         # Get database connection from client.
         engine = client.app.context['engine']
         with Session(engine) as db:
@@ -105,6 +118,7 @@ class TestVerify:
                 organisation='UK Ladybird Survey', group='UKLS')
             db.add(org_group)
             db.commit()
+            publish_rules(client)
 
             # Now try again with that test.
             response = client.post(
@@ -156,6 +170,7 @@ class TestVerify:
             )
             db.add(difficulty_rule)
             db.commit()
+            publish_rules(client)
 
             # Now try again with that test.
             response = client.post(
@@ -207,6 +222,7 @@ class TestVerify:
             )
             db.add(rule1)
             db.commit()
+            publish_rules(client)
 
             # Now try again with verification which should pass.
             response = client.post(
@@ -306,3 +322,92 @@ class TestVerify:
             assert usage['validation_requests'] == 0
             assert usage['verification_records'] == 11
             assert usage['validation_records'] == 0
+
+    def test_batch(self, client: TestClient, mocker):
+        # Get database connection from client.
+        engine = client.app.context['engine']
+        with Session(engine) as db:
+            # Mock the Indicia warehouse.
+            mocker.patch(
+                'app.species.indicia.make_search_request',
+                mock_make_search_request
+            )
+
+            # Create an org_group with rules for one taxon.
+            org_group = OrgGroup(
+                organisation='UK Ladybird Survey', group='UKLS')
+            db.add(org_group)
+            db.commit()
+            db.refresh(org_group)
+            difficulty_code = DifficultyCode(
+                code=1,
+                text='Easy',
+                org_group_id=org_group.id
+            )
+            db.add(difficulty_code)
+            db.commit()
+            db.refresh(difficulty_code)
+            db.add(DifficultyRule(
+                org_group_id=org_group.id,
+                organism_key='NBNORG0000010513',
+                difficulty_code_id=difficulty_code.id
+            ))
+            db.add(TenkmRule(
+                org_group_id=org_group.id,
+                organism_key='NBNORG0000010513',
+                km100='TL',
+                km10='14 15 16',
+                coord_system='OSGB'
+            ))
+            db.commit()
+            publish_rules(client)
+
+            # Submit records of several taxa, in and out of range, and one
+            # which is invalid.
+            sref = {"srid": 0, "gridref": "TL 123 456"}
+            pack = VerifyPack(
+                records=[
+                    {"id": 1, "date": "3/4/2024", "sref": sref,
+                     "tvk": "NBNSYS0000008319"},
+                    {"id": 2, "date": "3/4/2024", "sref": sref,
+                     "tvk": "NBNSYS0000008320"},
+                    {"id": 3, "date": "3/4/2024", "sref": sref,
+                     "tvk": "NBNSYS0000000000"},
+                    {"id": 4, "date": "3/4/2024",
+                     "sref": {"srid": 0, "gridref": "TL 654 321"},
+                     "tvk": "NBNSYS0000171481"},
+                ],
+            )
+            response = client.post(
+                '/verify',
+                json=pack.model_dump(),
+            )
+            assert response.status_code == 200
+            records = response.json()['records']
+            assert [record['id'] for record in records] == [1, 2, 3, 4]
+
+            assert records[0]['result'] == 'pass'
+            assert records[0]['id_difficulty'] == 1
+            assert records[0]['messages'] == [
+                'Rules run: tenkm',
+                'UK Ladybird Survey:UKLS:difficulty:1: Easy'
+            ]
+
+            assert records[1]['result'] == 'warn'
+            assert records[1]['messages'] == [
+                'No rules exist for this taxon.'
+            ]
+
+            assert records[2]['result'] == 'fail'
+            assert records[2]['messages'] == [
+                'TVK NBNSYS0000000000 not recognised.'
+            ]
+
+            # A common name of the first taxon shares its rules.
+            assert records[3]['result'] == 'fail'
+            assert records[3]['organism_key'] == 'NBNORG0000010513'
+            assert records[3]['messages'] == [
+                'UK Ladybird Survey:UKLS:difficulty:1: Easy',
+                'UK Ladybird Survey:UKLS:tenkm: Location is outside known '
+                'distribution.'
+            ]
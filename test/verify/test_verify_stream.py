@@ -0,0 +1,173 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.sqlmodels import (
+    OrgGroup,
+    TenkmRule,
+    DifficultyCode,
+    DifficultyRule
+)
+from app.verify.verify_stream import JsonItemReader
+
+from ..mocks import mock_make_search_request
+from .test_verify import publish_rules
+
+
+class TestJsonItemReader:
+
+    def test_ndjson(self):
+        reader = JsonItemReader()
+        items = reader.feed(b'{"id": 1}\n{"id"')
+        assert items == [{'id': 1}]
+        items = reader.feed(b': 2}\n\nnot json\n{"id": 3}')
+        assert items[0] == {'id': 2}
+        assert isinstance(items[1], ValueError)
+        items = reader.feed(b'', final=True)
+        assert items == [{'id': 3}]
+
+    def test_array(self):
+        reader = JsonItemReader()
+        assert reader.feed(b'  [ {"id": 1, "name": "a') == []
+        items = reader.feed(b'bc"} , {"id": 2}')
+        assert items == [{'id': 1, 'name': 'abc'}, {'id': 2}]
+        assert reader.feed(b']\n', final=True) == []
+
+        # An empty array.
+        reader = JsonItemReader()
+        assert reader.feed(b'[]', final=True) == []
+
+    def test_multibyte_split(self):
+        reader = JsonItemReader()
+        data = '{"name": "Bombus lucorum agg. é"}\n'.encode()
+        # Split the data in the middle of the two-byte character.
+        split = data.index(b'\xc3') + 1
+        assert reader.feed(data[:split]) == []
+        items = reader.feed(data[split:], final=True)
+        assert items == [{'name': 'Bombus lucorum agg. é'}]
+
+    def test_array_errors(self):
+        reader = JsonItemReader()
+        with pytest.raises(ValueError):
+            reader.feed(b'[{"id": 1} {"id": 2}]')
+
+        reader = JsonItemReader()
+        reader.feed(b'[{"id": 1},')
+        with pytest.raises(ValueError):
+            reader.feed(b'', final=True)
+
+        reader = JsonItemReader()
+        with pytest.raises(ValueError):
+            reader.feed(b'[{"id": 1}] {"id": 2}')
+
+
+class TestVerifyStream:
+
+    def test_stream(self, client: TestClient, mocker):
+        settings = client.app.context['settings']
+        settings.db.rules_commit = 'test123'
+        settings.db.rules_update_time = '2026-02-23 16:59:59'
+
+        engine = client.app.context['engine']
+        with Session(engine) as db:
+            # Mock the Indicia warehouse.
+            mocker.patch(
+                'app.species.indicia.make_search_request',
+                mock_make_search_request
+            )
+
+            # Create an org_group with rules for one taxon.
+            org_group = OrgGroup(
+                organisation='UK Ladybird Survey', group='UKLS')
+            db.add(org_group)
+            db.commit()
+            db.refresh(org_group)
+            difficulty_code = DifficultyCode(
+                code=1,
+                text='Easy',
+                org_group_id=org_group.id
+            )
+            db.add(difficulty_code)
+            db.commit()
+            db.refresh(difficulty_code)
+            db.add(DifficultyRule(
+                org_group_id=org_group.id,
+                organism_key='NBNORG0000010513',
+                difficulty_code_id=difficulty_code.id
+            ))
+            db.add(TenkmRule(
+                org_group_id=org_group.id,
+                organism_key='NBNORG0000010513',
+                km100='TL',
+                km10='14 15 16',
+                coord_system='OSGB'
+            ))
+            db.commit()
+            publish_rules(client)
+
+        records = [
+            {"id": 1, "date": "3/4/2024",
+             "sref": {"srid": 0, "gridref": "TL 123 456"},
+             "tvk": "NBNSYS0000008319"},
+            {"id": 2, "date": "3/4/2024"},
+            {"id": 3, "date": "3/4/2024",
+             "sref": {"srid": 0, "gridref": "TL 654 321"},
+             "tvk": "NBNSYS0000008319"},
+        ]
+
+        # Submit as NDJSON.
+        body = ''.join(json.dumps(record) + '\n' for record in records)
+        body += 'not json\n'
+        response = client.post(
+            '/verify/stream',
+            content=body,
+            headers={'Content-Type': 'application/x-ndjson'}
+        )
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith(
+            'application/x-ndjson')
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 5
+
+        assert lines[0]['id'] == 1
+        assert lines[0]['result'] == 'pass'
+        assert lines[0]['messages'] == [
+            'Rules run: tenkm',
+            'UK Ladybird Survey:UKLS:difficulty:1: Easy'
+        ]
+        assert lines[1]['item'] == 2
+        assert lines[1]['detail'][0]['loc'] == ['sref']
+        assert lines[2]['id'] == 3
+        assert lines[2]['result'] == 'fail'
+        assert lines[3]['item'] == 4
+        assert lines[3]['detail'].startswith('Invalid JSON.')
+        assert lines[4]['rules_commit'] == 'test123'
+        assert lines[4]['rules_update_time'] == '2026-02-23 16:59:59'
+        assert lines[4]['duration_ns'] > 0
+
+        # Submit as a JSON array, with a header selecting rules.
+        header = {"org_group_rules_list": [
+            {"organisation": "UK Ladybird Survey", "group": "UKLS",
+             "rules": ["phenology"]}
+        ]}
+        response = client.post(
+            '/verify/stream',
+            params={'verbose': 0},
+            json=[header, records[0], records[2]]
+        )
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 3
+        assert lines[0]['result'] == 'warn'
+        assert lines[0]['messages'] == ['No rules run.']
+        assert lines[1]['result'] == 'warn'
+        assert lines[2]['rules_commit'] == 'test123'
+
+        # An empty body only returns the trailer.
+        response = client.post('/verify/stream', content='')
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 1
+        assert lines[0]['rules_commit'] == 'test123'